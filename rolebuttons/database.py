@@ -4,7 +4,7 @@ import enum
 from typing import List, Optional
 
 from sqlalchemy import BigInteger, Boolean, Column, Enum, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, selectinload
 
 import discord
 
@@ -122,10 +122,14 @@ class RBView(database.base):
 
     @staticmethod
     def get_all(guild: discord.Guild = None) -> List[RBView]:
-        query = session.query(RBView)
+        query = session.query(RBView).options(
+            selectinload(RBView.messages),
+            selectinload(RBView.restrictions),
+            selectinload(RBView.options),
+        )
 
         if guild is not None:
-            query.filter_by(guild_id=guild.id)
+            query = query.filter_by(guild_id=guild.id)
 
         return query.all()
 
@@ -155,13 +159,18 @@ class RBView(database.base):
         self.messages.append(rbmessage)
         session.commit()
 
-    def add_restriction(self, role: discord.Role, type: RestrictionType):
-        restriction = (
+    def get_restriction(self, role_id: int) -> Optional[RBRestriction]:
+        query = (
             session.query(RBRestriction)
-            .filter_by(view_id=self.idx, role_id=role.id)
+            .filter_by(view_id=self.idx, role_id=role_id)
             .one_or_none()
         )
 
+        return query
+
+    def add_restriction(self, role: discord.Role, type: RestrictionType):
+        restriction = self.get_restriction(role.id)
+
         if not restriction:
             restriction = RBRestriction(view_id=self.idx, role_id=role.id)
 
@@ -240,6 +249,15 @@ class RBOption(database.base):
 
         return query
 
+    def get_item(self, discord_id: int) -> Optional[RBItem]:
+        query = (
+            session.query(RBItem)
+            .filter_by(option_id=self.idx, discord_id=discord_id)
+            .one_or_none()
+        )
+
+        return query
+
     def add_item(self, item: RBItem):
         self.items.append(item)
         session.commit()
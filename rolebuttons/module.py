@@ -1,4 +1,18 @@
-from typing import Dict, List, Optional, Union
+import asyncio
+from collections import defaultdict
+from operator import itemgetter
+from typing import (
+    Any,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 import discord
 from discord.ext import commands, tasks
@@ -10,15 +24,71 @@ from .database import DiscordType, RBItem, RBMessage, RBOption, RBView, Restrict
 from .objects import RBViewUI
 from .utils import RBUtils as rbutils
 
-_ = i18n.Translator("modules/fsi").translate
+_translate = i18n.Translator("modules/fsi").translate
 guild_log = logger.Guild.logger()
 bot_log = logger.Bot.logger()
 
+# Maximum number of messages edited at once when attaching persistent views
+ATTACH_CONCURRENCY = 10
+# Number of messages searched in channel history when fetching attached messages
+HISTORY_LIMIT = 100
+
+RESTRICTION_TYPES = tuple(RestrictionType.__members__)
+RESTRICTION_TYPES_STR = ", ".join(RESTRICTION_TYPES)
+
+
+def _(ctx, string: str) -> str:
+    """Translate string and cache it in context.
+
+    Embeds use the same strings over and over, so every string
+    is translated only once per command invocation.
+
+    Args:
+        ctx: Translation context
+        string: String to translate
+
+    Returns: :class:`str` translated string
+    """
+    cache = getattr(ctx, "_rb_translations", None)
+    if cache is None:
+        cache = {}
+        try:
+            ctx._rb_translations = cache
+        except AttributeError:
+            return _translate(ctx, string)
+
+    if string not in cache:
+        cache[string] = _translate(ctx, string)
+
+    return cache[string]
+
+
+def _add_fields(embed: discord.Embed, *fields: Tuple[str, Any, bool]):
+    """Add multiple fields to embed at once.
+
+    Fields are appended to embed's field list directly,
+    the same way :meth:`discord.Embed.add_field` does.
+
+    Args:
+        embed: Embed to add fields to
+        fields: Tuples of field's name, value and inline flag
+    """
+    try:
+        embed_fields = embed._fields
+    except AttributeError:
+        embed_fields = embed._fields = []
+
+    embed_fields.extend(
+        {"inline": inline, "name": str(name), "value": str(value)}
+        for name, value, inline in fields
+    )
+
 
 class RoleButtons(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.views = {}
+        self.views: Dict[int, RBViewUI] = {}
+        self.view_hashes: Dict[int, int] = {}
 
         self.load_views.start()
 
@@ -35,43 +105,210 @@ class RoleButtons(commands.Cog):
 
         self.views = {}
 
+    @staticmethod
+    def _view_hash(view_ui: RBViewUI) -> int:
+        """Compute hash of View's components as they are sent to Discord.
+
+        The components contain translated placeholder and button labels
+        and resolved emojis, so change of guild language or emoji
+        changes the hash as well.
+
+        Args:
+            view_ui: RBViewUI object
+
+        Returns: :class:`int` hash of View's components
+        """
+        return hash(repr(view_ui.to_components()))
+
+    async def _fetch_messages(
+        self,
+        semaphore: asyncio.Semaphore,
+        guild_id: int,
+        channel_id: int,
+        message_ids: Set[int],
+    ) -> Dict[int, discord.Message]:
+        """Fetch all messages from one channel at once.
+
+        If there are more messages in the channel, they are looked up
+        in channel's history first. Messages not found there are
+        fetched one by one.
+
+        Args:
+            semaphore: Semaphore limiting number of concurrent requests
+            guild_id: ID of channel's guild
+            channel_id: ID of channel
+            message_ids: IDs of messages to fetch
+
+        Returns: :class:`Dict[int, discord.Message]` of found messages by ID
+        """
+        found = {}
+
+        async with semaphore:
+            channel = self.bot.get_channel(channel_id)
+            if channel is None:
+                for message_id in message_ids:
+                    dc_message = await utils.discord.get_message(
+                        self.bot, guild_id, channel_id, message_id
+                    )
+                    if dc_message:
+                        found[message_id] = dc_message
+                return found
+
+            if len(message_ids) > 1:
+                try:
+                    async for dc_message in channel.history(
+                        limit=HISTORY_LIMIT,
+                        after=discord.Object(id=min(message_ids) - 1),
+                        oldest_first=True,
+                    ):
+                        if dc_message.id in message_ids:
+                            found[dc_message.id] = dc_message
+                except discord.HTTPException:
+                    pass
+
+            for message_id in message_ids - found.keys():
+                try:
+                    found[message_id] = await channel.fetch_message(message_id)
+                except discord.HTTPException:
+                    pass
+
+        return found
+
+    async def _attach_view(
+        self,
+        semaphore: asyncio.Semaphore,
+        view_ui: RBViewUI,
+        message: RBMessage,
+        dc_message: Optional[discord.Message],
+    ) -> bool:
+        """Attach persistent view to Discord message.
+
+        Args:
+            semaphore: Semaphore limiting number of concurrent edits
+            view_ui: View to attach
+            message: RBMessage DB object the view belongs to
+            dc_message: Discord message or None if it was not found
+
+        Returns: :class:`bool` True if view was attached, False otherwise
+        """
+        if dc_message is None:
+            await bot_log.warning(
+                None,
+                None,
+                f"Can't assign RoleButtons view."
+                f"Message with id {message.message_id} in channel {message.channel_id} not found! ",
+            )
+            return False
+
+        async with semaphore:
+            await dc_message.edit(view=view_ui)
+
+        return True
+
+    async def _gather_logged(self, coros: List[Coroutine]) -> list:
+        """Run coroutines concurrently and log raised exceptions.
+
+        Args:
+            coros: Coroutines to run
+
+        Returns: :class:`list` of results, exceptions are replaced by None
+        """
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        for idx, result in enumerate(results):
+            if isinstance(result, Exception):
+                await bot_log.error(
+                    None,
+                    None,
+                    "Exception occured during loading RoleButtons views.",
+                    exception=result,
+                )
+                results[idx] = None
+        return results
+
     @tasks.loop(seconds=10.0, count=1)
-    async def load_views(self):
+    async def load_views(self, force: bool = False):
         """Task used to load all view as persistent.
         It has count=1 so it runs only once after called.
         Also using before_loop it ensures this is run only
         after bot is ready.
+
+        Messages are fetched per channel and edited concurrently,
+        limited by :data:`ATTACH_CONCURRENCY` to avoid hitting rate limits.
+        Messages of Views which did not change since last successful
+        load are skipped.
+
+        Args:
+            force: Edit messages of all Views, even unchanged ones
         """
         self.views = {}
+        old_hashes = {} if force else self.view_hashes
+        self.view_hashes = {}
+        new_hashes = {}
 
         views = RBView.get_all()
 
+        semaphore = asyncio.Semaphore(ATTACH_CONCURRENCY)
+        by_channel: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        attach_list = []
+
         for view in views:
             view_ui = RBViewUI(self.bot, view)
             self.views[view.idx] = view_ui
             self.bot.add_view(view_ui)
 
+            view_hash = self._view_hash(view_ui)
+            new_hashes[view.idx] = view_hash
+            if old_hashes.get(view.idx) == view_hash:
+                continue
+
             for message in view.messages:
-                dc_message = await utils.discord.get_message(
-                    self.bot, view.guild_id, message.channel_id, message.message_id
+                by_channel[(view.guild_id, message.channel_id)].add(message.message_id)
+                attach_list.append((view_ui, message))
+
+        msg_cache: Dict[int, discord.Message] = {}
+        fetched = await self._gather_logged(
+            [
+                self._fetch_messages(semaphore, guild_id, channel_id, message_ids)
+                for (guild_id, channel_id), message_ids in by_channel.items()
+            ]
+        )
+        for messages in fetched:
+            if messages:
+                msg_cache.update(messages)
+
+        attached = await self._gather_logged(
+            [
+                self._attach_view(
+                    semaphore, view_ui, message, msg_cache.get(message.message_id)
                 )
-                if dc_message:
-                    await dc_message.edit(view=view_ui)
-                else:
-                    await bot_log.warning(
-                        None,
-                        None,
-                        f"Can't assign RoleButtons view."
-                        f"Message with id {message.message_id} in channel {message.channel_id} not found! ",
-                    )
-        print("All RoleButtons persistent views loaded.")
+                for view_ui, message in attach_list
+            ]
+        )
+
+        # Views with any message not attached are edited again on next reload
+        failed = {
+            view_ui.view.idx
+            for (view_ui, message), result in zip(attach_list, attached)
+            if not result
+        }
+        for view_idx, view_hash in new_hashes.items():
+            if view_idx not in failed:
+                self.view_hashes[view_idx] = view_hash
+
+        await bot_log.info(
+            None, None, f"Loaded {len(self.views)} RoleButtons persistent views."
+        )
 
     @load_views.before_loop
     async def before_load(self):
         """Ensures that bot is ready before loading any
         persitant view.
         """
-        print("Loading RoleButtons persistent views. Waiting for bot being ready.")
+        await bot_log.info(
+            None,
+            None,
+            "Loading RoleButtons persistent views. Waiting for bot being ready.",
+        )
         await self.bot.wait_until_ready()
 
     async def _get_item_embed(
@@ -101,14 +338,17 @@ class RoleButtons(commands.Cog):
             name = dc_items[0].mention
             type = dc_items[0].__class__.__name__
 
-        embed.add_field(name=_(ctx, "ID"), value=str(item.discord_id))
-        embed.add_field(name=_(ctx, "Option ID"), value=option.idx)
-        embed.add_field(name=_(ctx, "Name"), value=name)
-        embed.add_field(name=_(ctx, "Type"), value=type)
+        _add_fields(
+            embed,
+            (_(ctx, "ID"), item.discord_id, True),
+            (_(ctx, "Option ID"), option.idx, True),
+            (_(ctx, "Name"), name, True),
+            (_(ctx, "Type"), type, True),
+        )
 
         return embed
 
-    async def _get_view_embed(self, ctx, view) -> discord.Embed:
+    def _get_view_embed(self, ctx, view) -> discord.Embed:
         """Create information embed for View.
 
         Args:
@@ -122,51 +362,49 @@ class RoleButtons(commands.Cog):
             author=ctx.author, title=_(ctx, "View informations")
         )
 
-        embed.add_field(name=_(ctx, "ID"), value=str(view.idx), inline=True)
-        embed.add_field(
-            name=_(ctx, "Unique (only one role)"),
-            value=_(ctx, "Yes") if view.unique else _(ctx, "No"),
-            inline=True,
-        )
+        if view.restrictions:
+            roles = self._get_view_roles(ctx, view)
+            allowed_roles = ", ".join(roles[RestrictionType.ALLOW])
+            disallowed_roles = ", ".join(roles[RestrictionType.DISALLOW])
+        else:
+            allowed_roles = ""
+            disallowed_roles = ""
 
-        embed.add_field(
-            name=_(ctx, "Messages"),
-            value=(
-                "\n".join(
-                    [
+        _add_fields(
+            embed,
+            (_(ctx, "ID"), view.idx, True),
+            (
+                _(ctx, "Unique (only one role)"),
+                _(ctx, "Yes") if view.unique else _(ctx, "No"),
+                True,
+            ),
+            (
+                _(ctx, "Messages"),
+                (
+                    "\n".join(
                         f"({message.message_id}, {message.channel_id})"
                         for message in view.messages
-                    ]
-                )
-                if view.messages
-                else "-"
+                    )
+                    if view.messages
+                    else "-"
+                ),
+                True,
+            ),
+            (
+                _(ctx, "Allowed roles"),
+                allowed_roles if len(allowed_roles) != 0 else _(ctx, "All"),
+                True,
+            ),
+            (
+                _(ctx, "Disallowed roles"),
+                disallowed_roles if len(disallowed_roles) != 0 else _(ctx, "None"),
+                True,
+            ),
+            (
+                _(ctx, "Options"),
+                ("\n".join(self._get_option_names(ctx, view)) if view.options else "-"),
+                True,
             ),
-            inline=True,
-        )
-
-        roles = await self._get_view_roles(ctx, view)
-
-        allowed_roles = ", ".join(roles[RestrictionType.ALLOW])
-        disallowed_roles = ", ".join(roles[RestrictionType.DISALLOW])
-
-        embed.add_field(
-            name=_(ctx, "Allowed roles"),
-            value=allowed_roles if len(allowed_roles) != 0 else _(ctx, "All"),
-            inline=True,
-        )
-
-        embed.add_field(
-            name=_(ctx, "Disallowed roles"),
-            value=disallowed_roles if len(disallowed_roles) != 0 else _(ctx, "None"),
-            inline=True,
-        )
-
-        options = await self._get_option_names(ctx, view)
-
-        embed.add_field(
-            name=_(ctx, "Options"),
-            value="\n".join(options) if options else "-",
-            inline=True,
         )
 
         return embed
@@ -184,40 +422,22 @@ class RoleButtons(commands.Cog):
             author=ctx.author, title=_(ctx, "Option informations")
         )
 
-        embed.add_field(name=_(ctx, "ID"), value=str(option.idx), inline=True)
-        embed.add_field(name=_(ctx, "View ID"), value=str(option.view_id), inline=True)
-        embed.add_field(
-            name=_(ctx, "Label"),
-            value=option.label,
-            inline=True,
-        )
-        embed.add_field(
-            name=_(ctx, "Emoji"),
-            value=rbutils.emoji_decode(self.bot, option.emoji),
-            inline=True,
-        )
-        embed.add_field(
-            name=_(ctx, "Order"),
-            value=option.oid,
-            inline=True,
-        )
-        embed.add_field(
-            name=_(ctx, "Description"),
-            value=option.description,
-            inline=True,
-        )
-
-        items = await self._get_item_names(ctx, option)
-
-        embed.add_field(
-            name=_(ctx, "Items"),
-            value=", ".join(sorted(items)) if items else "-",
-            inline=True,
+        items = self._get_item_names(ctx, option)
+
+        _add_fields(
+            embed,
+            (_(ctx, "ID"), option.idx, True),
+            (_(ctx, "View ID"), option.view_id, True),
+            (_(ctx, "Label"), option.label, True),
+            (_(ctx, "Emoji"), rbutils.emoji_decode(self.bot, option.emoji), True),
+            (_(ctx, "Order"), option.oid, True),
+            (_(ctx, "Description"), option.description, True),
+            (_(ctx, "Items"), ", ".join(items) if items else "-", True),
         )
 
         return embed
 
-    async def _get_view_roles(self, ctx, view: RBView) -> Dict[RestrictionType, str]:
+    def _get_view_roles(self, ctx, view: RBView) -> Dict[RestrictionType, List[str]]:
         """Create dict where key is RestrictionType and values are lists
         of strings representing role names.
 
@@ -225,42 +445,32 @@ class RoleButtons(commands.Cog):
             ctx: Command context
             view: View DB object
 
-        Returns: :class:`discord.Embed` information embed
+        Returns: :class:`Dict[RestrictionType, List[str]]` of role names
         """
-        roles = {}
-        roles[RestrictionType.ALLOW] = []
-        roles[RestrictionType.DISALLOW] = []
+        roles = {RestrictionType.ALLOW: [], RestrictionType.DISALLOW: []}
 
         for restriction in view.restrictions:
             role = ctx.guild.get_role(restriction.role_id)
-
-            if role is None:
-                name = "(restriction.role_id)"
-            else:
-                name = role.name
-
-            roles[restriction.type].append(name)
+            roles[restriction.type].append(
+                role.name if role is not None else f"({restriction.role_id})"
+            )
 
         return roles
 
-    async def _get_option_names(self, ctx, view) -> List[str]:
-        """Create list of option names in format `(id) label`
+    def _get_option_names(self, ctx, view) -> Iterator[str]:
+        """Create option names in format `(id) label`
 
         Args:
             ctx: Command context
             view: View DB object
 
-        Returns: :class:`List[str]` of formated option names
+        Returns: :class:`Iterator[str]` of formated option names
         """
-        options = []
-
-        for option in view.options:
-            options.append("({id}) {label}".format(id=option.idx, label=option.label))
+        return (f"({option.idx}) {option.label}" for option in view.options)
 
-        return options
-
-    async def _get_item_names(self, ctx, option: RBOption) -> str:
-        """Create list of option's item names as tagging strings
+    def _get_item_names(self, ctx, option: RBOption) -> List[str]:
+        """Create list of option's item names as tagging strings.
+        Roles are listed before channels, both sorted by name.
 
         Args:
             ctx: Command context
@@ -271,19 +481,24 @@ class RoleButtons(commands.Cog):
         items = []
         for item in option.items:
             if item.discord_type == DiscordType.ROLE:
-                role = ctx.guild.get_role(item.discord_id)
-                if not role:
-                    items.append("(\\@{id})".format(id=item.discord_id))
-                else:
-                    items.append(role.mention)
+                dc_item = ctx.guild.get_role(item.discord_id)
+                placeholder = "(\\@{id})"
             else:
-                channel = ctx.guild.get_channel(item.discord_id)
-                if not channel or not isinstance(channel, discord.abc.GuildChannel):
-                    items.append("(\\#{id})".format(id=item.discord_id))
-                else:
-                    items.append(channel.mention)
+                dc_item = ctx.guild.get_channel(item.discord_id)
+                placeholder = "(\\#{id})"
+
+            if dc_item is not None:
+                sort_key = (item.discord_type.value, dc_item.name.lower())
+                label = dc_item.mention
+            else:
+                sort_key = (item.discord_type.value, str(item.discord_id))
+                label = placeholder.format(id=item.discord_id)
+
+            items.append((sort_key, label))
+
+        items.sort(key=itemgetter(0))
 
-        return items
+        return [label for _sort_key, label in items]
 
     # COMMANDS
 
@@ -295,12 +510,15 @@ class RoleButtons(commands.Cog):
 
     @check.acl2(check.ACLevel.MOD)
     @rolebuttons_.command(name="reload")
-    async def rolebuttons_reload(self, ctx):
+    async def rolebuttons_reload(self, ctx, force: bool = False):
         """Reload all Views and re-attach them
         to their messages.
+
+        Args:
+            force: Re-attach even Views which did not change
         """
         self._unload_views()
-        self.load_views.start()
+        self.load_views.start(force)
         await ctx.send(_(ctx, "All Views reloaded."))
 
     @check.acl2(check.ACLevel.MOD)
@@ -328,10 +546,7 @@ class RoleButtons(commands.Cog):
     async def rolebuttons_list(self, ctx):
         """Get list of Views"""
         views = RBView.get_all(ctx.guild)
-        embeds = []
-        for view in views:
-            embed = await self._get_view_embed(ctx, view)
-            embeds.append(embed)
+        embeds = [self._get_view_embed(ctx, view) for view in views]
 
         scrollable_embed = ScrollableEmbed(ctx, embeds)
         await scrollable_embed.scroll()
@@ -349,7 +564,7 @@ class RoleButtons(commands.Cog):
             await ctx.reply(_(ctx, "View with ID {id} not found.").format(id=view_id))
             return
 
-        embed = await self._get_view_embed(ctx, view)
+        embed = self._get_view_embed(ctx, view)
         embed.title = _(ctx, "Do you want to delete this view?")
 
         c_view = ConfirmView(ctx, embed)
@@ -362,7 +577,6 @@ class RoleButtons(commands.Cog):
             if view_ui is not None:
                 view_ui.stop()
             view.delete()
-            view.save()
             await ctx.send(_(ctx, "View ID {id} deleted.").format(id=view_id))
         else:
             await ctx.send(_(ctx, "Deleting aborted."))
@@ -380,7 +594,7 @@ class RoleButtons(commands.Cog):
             await ctx.reply(_(ctx, "View with ID {id} not found.").format(id=view_id))
             return
 
-        embed = await self._get_view_embed(ctx, view)
+        embed = self._get_view_embed(ctx, view)
 
         await ctx.send(embed=embed)
 
@@ -623,14 +837,15 @@ class RoleButtons(commands.Cog):
             role: Affected role
             type: ALLOW or DISALLOW
         """
-        types = ["ALLOW", "DISALLOW"]
-        if type not in types:
+        if type not in RESTRICTION_TYPES:
             await ctx.reply(
-                _(ctx, "Type must be one of these: {types}.").format(", ".join(types))
+                _(ctx, "Type must be one of these: {types}.").format(
+                    types=RESTRICTION_TYPES_STR
+                )
             )
             return
 
-        type = RestrictionType[type]
+        type = RestrictionType.__members__[type]
 
         view = RBView.get(ctx.guild, view_id)
         if view is None:
@@ -664,14 +879,7 @@ class RoleButtons(commands.Cog):
         role_id = role if isinstance(role, int) else role.id
         role_name = "({})".format(role) if isinstance(role, int) else role.name
 
-        restriction = next(
-            (
-                restriction
-                for restriction in view.restrictions
-                if restriction.role_id == role_id
-            ),
-            None,
-        )
+        restriction = view.get_restriction(role_id)
 
         if not restriction:
             await ctx.send(
@@ -700,14 +908,10 @@ class RoleButtons(commands.Cog):
 
         roles, channels = await rbutils.process_items(option.items, ctx.guild)
 
-        items = []
-
-        for item in roles + channels:
-            dummy = ItemDummy()
-            dummy.id = item.id
-            dummy.name = item.name
-            dummy.type = item.__class__.__name__
-            items.append(dummy)
+        items = [
+            ItemDummy(item.id, item.name, item.__class__.__name__)
+            for item in roles + channels
+        ]
 
         tables = utils.text.create_table(
             items,
@@ -736,21 +940,15 @@ class RoleButtons(commands.Cog):
             )
             return
 
-        if isinstance(dc_item, int):  # THIS SHOULD BE MOVED INTO CORE -> UTILS
-            role = discord.utils.get(ctx.guild.roles, id=dc_item)
-            if role:
-                dc_item = role
-            else:
-                channel = discord.utils.get(ctx.guild.channels, id=dc_item)
-                if channel is not None:
-                    dc_item = channel
+        if isinstance(dc_item, int):
+            dc_item = rbutils.resolve_guild_object(ctx.guild, dc_item) or dc_item
 
         dc_item_id = dc_item if isinstance(dc_item, int) else dc_item.id
         dc_item_name = f"({dc_item})" if isinstance(dc_item, int) else dc_item.name
 
-        items = [item for item in option.items if item.discord_id == dc_item_id]
+        item = option.get_item(dc_item_id)
 
-        if len(items) != 1:
+        if item is None:
             await ctx.reply(
                 _(ctx, "Item {name} in Option ID {id} not found.").format(
                     name=dc_item_name, id=option_id
@@ -758,8 +956,6 @@ class RoleButtons(commands.Cog):
             )
             return
 
-        item = items[0]
-
         embed = await self._get_item_embed(ctx, option, item)
         embed.title = _(ctx, "Do you want to delete this item?")
 
@@ -897,12 +1093,14 @@ class RoleButtons(commands.Cog):
         await ctx.reply(_(ctx, "Message with ID {id} detached.").format(id=message_id))
 
 
-class ItemDummy:
+class ItemDummy(NamedTuple):
     """
     Dummy class used for creatig item list.
     """
 
-    pass
+    id: int
+    name: str
+    type: str
 
 
 async def setup(bot) -> None:
@@ -75,14 +75,35 @@ class RBUtils:
         else:
             return emoji
 
+    @staticmethod
+    def resolve_guild_object(
+        guild: discord.Guild, obj_id: int
+    ) -> Optional[Union[discord.Role, discord.abc.GuildChannel]]:
+        """Get guild's role or channel by its ID.
+
+        Args:
+            guild: :class:`discord.Guild` to search in
+            obj_id: ID of role or channel
+
+        Returns:
+            :class:`discord.Role` or :class:`discord.abc.GuildChannel`,
+            None if not found
+        """
+        role = guild.get_role(obj_id)
+        if role is not None:
+            return role
+
+        return guild.get_channel(obj_id)
+
     @staticmethod
     async def process_items(
         items: List[RBItem], guild: discord.Guild
-    ) -> Tuple[discord.Role, discord.abc.GuildChannel]:
+    ) -> Tuple[List[discord.Role], List[discord.abc.GuildChannel]]:
         """Internal function to convert List of RBItem DB objects
         to Discord roles and channels.
         Args:
             items: List of :class:`RBItem` to process
+            guild: :class:`discord.Guild` the items belong to
 
         Returns:
             Tuple of Lists, first containing roles, second containing Channels
@@ -1,12 +1,17 @@
-from typing import List, Set
+import asyncio
+from typing import List
 
 import discord
 from discord.ext import commands
 
-from pie import check, i18n, utils
+from pie import check, i18n, logger, utils
 from pie.utils.objects import ConfirmView, ScrollableEmbed
 
 _ = i18n.Translator("modules/fsi").translate
+guild_log = logger.Guild.logger()
+
+# Maximum number of members whose role is removed at once
+REMOVE_CONCURRENCY = 5
 
 
 class RoleManager(commands.Cog):
@@ -14,34 +19,55 @@ class RoleManager(commands.Cog):
         self.bot = bot
 
     # HELPER FUNCTIONS
-    def _create_embeds(ctx, title: str, description: str) -> List[discord.Embed]:
-        elements = []
+    @staticmethod
+    def _create_embeds(ctx, title: str, description: List[str]) -> List[discord.Embed]:
         """Create embed for member list.
         Args:
             ctx: Command context.
-            option: Item's title.
+            title: Embed's title.
             description: list of items.
-        Returns: :class:`discord.Embed` information embed
+        Returns: :class:`List[discord.Embed]` information embeds
         """
+        elements = []
         chunk_size = 15
 
+        template = utils.discord.create_embed(author=ctx.author, title=title)
+
         for i in range(0, len(description), chunk_size):
-            page = utils.discord.create_embed(
-                author=ctx.author,
-                title=title,
-                description="\n".join(description[i : i + chunk_size]),
-            )
+            page_slice = description[i : i + chunk_size]
+            page = template.copy()
+            page.description = "\n".join(page_slice)
 
             elements.append(page)
 
         return elements
 
-    def _get_intersection(role_base: str, role_remove: str) -> Set[discord.Member]:
-        base_members = set(role_base.members)
-        remove_members = set(role_remove.members)
+    @staticmethod
+    def _get_intersection(
+        role_base: discord.Role, role_remove: discord.Role
+    ) -> List[discord.Member]:
+        """Get members having both roles, in order of base role's members.
+        Args:
+            role_base: Base role.
+            role_remove: Role to remove.
+        Returns: :class:`List[discord.Member]` members with both roles
+        """
+        remove_ids = {member.id for member in role_remove.members}
 
-        role_intersection = base_members & remove_members
-        return role_intersection
+        return [member for member in role_base.members if member.id in remove_ids]
+
+    @staticmethod
+    async def _remove_role(
+        semaphore: asyncio.Semaphore, member: discord.Member, role: discord.Role
+    ):
+        """Remove role from member.
+        Args:
+            semaphore: Semaphore limiting number of concurrent requests.
+            member: Affected member.
+            role: Role to remove.
+        """
+        async with semaphore:
+            await member.remove_roles(role, reason="rolemanager")
 
     # MAIN
     @commands.guild_only()
@@ -66,12 +92,12 @@ class RoleManager(commands.Cog):
         if member_list:
             title = _(ctx, "Members with forbidden role")
 
-            name_list = list(
+            name_list = [
                 "{name} ({mention})".format(
                     name=member.display_name, mention=member.mention
                 )
                 for member in member_list
-            )
+            ]
 
             embeds = RoleManager._create_embeds(
                 ctx=ctx,
@@ -107,10 +133,39 @@ class RoleManager(commands.Cog):
             view = ConfirmView(ctx, embed)
             value = await view.send()
             if value:
-                for member in member_list:
-                    await member.remove_roles(role_remove)
+                status = await ctx.send(
+                    _(ctx, "Removing role from {count} members...").format(
+                        count=len(member_list)
+                    )
+                )
 
-                await ctx.send(_(ctx, "Successfully removed selected role."))
+                semaphore = asyncio.Semaphore(REMOVE_CONCURRENCY)
+                results = await asyncio.gather(
+                    *(
+                        RoleManager._remove_role(semaphore, member, role_remove)
+                        for member in member_list
+                    ),
+                    return_exceptions=True,
+                )
+                errors = [result for result in results if isinstance(result, Exception)]
+
+                if errors:
+                    await guild_log.error(
+                        ctx.author,
+                        ctx.channel,
+                        f"Could not remove role {role_remove.name} "
+                        f"from {len(errors)} members.",
+                        exception=errors[0],
+                    )
+                    await status.edit(
+                        content=_(
+                            ctx, "Role could not be removed from {count} members."
+                        ).format(count=len(errors))
+                    )
+                else:
+                    await status.edit(
+                        content=_(ctx, "Successfully removed selected role.")
+                    )
             else:
                 await ctx.send(_(ctx, "Aborted."))
 